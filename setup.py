@@ -24,5 +24,5 @@ setuptools.setup(
             "xerxes_config=xerxes_protocol.cli_util:address_config"
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.10",
 )
@@ -39,3 +39,20 @@ def hw_com(com_port, port_name):
         warnings.warn(UserWarning(f"Using mockup COM port: {com_port}"))
     return com_port.port == port_name
 
+
+@pytest.fixture
+def loopback():
+    """Serial port on a pseudo-terminal and the fd of its other end."""
+    if os.name == "nt":
+        pytest.skip("pseudo-terminals are not available on windows")
+
+    import pty
+    import tty
+    master, slave = pty.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    com = serial.Serial(os.ttyname(slave), baudrate=115200, timeout=0.02)
+    yield com, master
+    com.close()
+    os.close(master)
+    os.close(slave)
@@ -0,0 +1,7 @@
+from xerxes_protocol.network import checksum
+
+
+def device_frame(src: int, dst: int, payload: bytes) -> bytes:
+    """Build a raw Xerxes frame, as sent by a device."""
+    msg = bytes([0x01, len(payload) + 5, src, dst]) + payload
+    return msg + checksum(msg)
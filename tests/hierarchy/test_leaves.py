@@ -1,17 +1,216 @@
+import asyncio
+from dataclasses import dataclass
+import struct
+from types import SimpleNamespace
+
+import pytest
+
 from xerxes_protocol.hierarchy.leaves.utils import leaf_generator
 from xerxes_protocol.network import Addr, XerxesNetwork
 from xerxes_protocol.hierarchy.root import XerxesRoot
-from xerxes_protocol.hierarchy.leaves.leaf import Leaf
+from xerxes_protocol.hierarchy.leaves.leaf import (
+    Leaf,
+    LeafData,
+    WriteErrorReadOnly,
+    _MemoryElementDescriptor,
+    _plan_reads,
+)
+from xerxes_protocol.hierarchy.leaves.pressure import PLeaf, PLeafData
+from xerxes_protocol.memory import (
+    GAIN_PV0_OFFSET,
+    MEM_UNLOCKED_OFFSET,
+    PV0_OFFSET,
+    OFFSET_CONFIG_BITS,
+    OFFSET_PV0_OFFSET,
+)
+from xerxes_protocol.units.pressure import Pressure
+from xerxes_protocol.units.temp import Celsius
+
+
+@pytest.fixture
+def root(com_port) -> XerxesRoot:
+    return XerxesRoot(Addr(0), XerxesNetwork(com_port).init())
+
+
+@pytest.fixture
+def recording_leaf(root) -> "_RecordingLeaf":
+    return _RecordingLeaf(Addr(1), root)
+
 
 class TestLeaf:
     def test_generated(self, com_port, hw_com):
         xn = XerxesNetwork(com_port).init()
         xr = XerxesRoot(Addr(0), xn)
-        
+
         l = Leaf(Addr(1), xr)
+        # slotted, no per-instance dict
+        assert not hasattr(l, "__dict__")
         if hw_com:
             leaf = leaf_generator(l)
             assert l != leaf
-        
-        
-class TestPressureLeaf: ...
\ No newline at end of file
+
+    def test_eq_hash(self, root):
+        assert Leaf(1, root) == Leaf(Addr(1), root)
+        assert Leaf(1, root) != Leaf(2, root)
+        assert Leaf(1, root) != PLeaf(1, root)
+        assert len({Leaf(1, root), Leaf(1, root), Leaf(2, root)}) == 2
+
+    def test_memory_map_descriptors(self):
+        # memory map access is defined on the class, not per instance
+        assert isinstance(Leaf.__dict__["gain_pv0"], _MemoryElementDescriptor)
+        assert isinstance(Leaf.__dict__["device_uid"], _MemoryElementDescriptor)
+        assert "gain_pv0" not in PLeaf.__dict__
+        assert PLeaf.gain_pv0 is Leaf.gain_pv0
+
+    def test_read_params_coalesced(self, recording_leaf):
+        values = recording_leaf.read_params(
+            ["gain_pv1", "gain_pv0", "offset_pv0"]
+        )
+        assert recording_leaf.requests == [
+            (GAIN_PV0_OFFSET, 8),
+            (OFFSET_PV0_OFFSET, 4),
+        ]
+        assert values == {"gain_pv0": 0.0, "gain_pv1": 1.0, "offset_pv0": 4.0}
+
+    def test_read_params_wrong_length(self, recording_leaf, monkeypatch):
+        # e.g. a stale reply to a longer read must not be decoded
+        monkeypatch.setattr(
+            recording_leaf, "read_reg_net", lambda reg_addr, n: bytes(n + 12)
+        )
+        with pytest.raises(struct.error):
+            recording_leaf.read_params(["gain_pv0", "gain_pv1"])
+
+    def test_read_plan_cached(self, recording_leaf):
+        # the order and repetition of the keys do not make a new plan
+        recording_leaf.read_params(["gain_pv0", "gain_pv1"])
+        misses = _plan_reads.cache_info().misses
+        recording_leaf.read_params(["gain_pv1", "gain_pv0", "gain_pv1"])
+        assert _plan_reads.cache_info().misses == misses
+        assert recording_leaf.requests == [(GAIN_PV0_OFFSET, 8)] * 2
+
+    def test_fetch_config(self, recording_leaf):
+        config = recording_leaf.fetch_config()
+        # gaps in the non-volatile memory split the reads
+        assert recording_leaf.requests == [(0, 36), (40, 1), (44, 1), (48, 16)]
+        assert config["offset_pv3"] == 7.0
+        assert config["desired_cycle_time_us"] == 8
+
+    def test_fetch_volatile(self, recording_leaf):
+        volatile = recording_leaf.fetch_volatile()
+        assert recording_leaf.requests == [
+            (PV0_OFFSET, MEM_UNLOCKED_OFFSET + 4 - PV0_OFFSET)
+        ]
+        assert len(volatile) == 33
+        assert "pv0" in volatile
+        assert volatile["memory_lock"] == MEM_UNLOCKED_OFFSET // 4
+
+    def test_read_only_element(self, recording_leaf):
+        with pytest.raises(WriteErrorReadOnly):
+            recording_leaf.device_uid = 1
+        recording_leaf.device_config = 3
+        assert recording_leaf.writes == [(OFFSET_CONFIG_BITS, b"\x03")]
+
+    def test_apply_config(self, recording_leaf):
+        config = {"gain_pv0": 2.0, "device_config": 3}
+        asyncio.run(recording_leaf.apply_config(config))
+        assert sorted(recording_leaf.writes) == [
+            (GAIN_PV0_OFFSET, struct.pack("<f", 2.0)),
+            (OFFSET_CONFIG_BITS, b"\x03"),
+        ]
+
+        with pytest.raises(KeyError):
+            asyncio.run(recording_leaf.apply_config({"no_such_element": 1}))
+
+
+@dataclass(eq=False, slots=True)
+class _SingleFieldData(LeafData):
+    temperature: Celsius
+
+
+class _RecordingLeaf(Leaf):
+    """Leaf answering read requests locally, with 4-byte counters."""
+
+    def __init__(self, addr, root):
+        super().__init__(addr, root)
+        self.requests = []
+        self.writes = []
+
+    def write_reg_net(self, reg_addr, value):
+        self.writes.append((reg_addr, value))
+        return True
+
+    def read_reg_net(self, reg_addr, length):
+        self.requests.append((reg_addr, length))
+        words = range(reg_addr // 4, (reg_addr + length + 3) // 4)
+        raw = b"".join(
+            struct.pack("<f", w) if w < 8 else struct.pack("<I", w)
+            for w in words
+        )
+        return raw[:length]
+
+
+class _ReplyPLeaf(PLeaf):
+    """Pressure leaf answering the fetch request with a fixed payload."""
+
+    __slots__ = ("payload",)
+
+    def exchange(self, payload):
+        return SimpleNamespace(payload=self.payload)
+
+
+class TestPressureLeaf:
+    def test_fetch(self, root):
+        leaf = _ReplyPLeaf(Addr(1), root)
+        leaf.payload = struct.pack("<ffff", 1000.0, 21.5, 22.5, 23.5)
+
+        data = leaf.fetch()
+        assert isinstance(data, PLeafData)
+        assert data.temperature_sensor.preferred() == 21.5
+
+    def test_fetch_wrong_length(self, root):
+        leaf = _ReplyPLeaf(Addr(1), root)
+
+        # e.g. a longer reply to another message must not be decoded
+        leaf.payload = struct.pack("<fffff", 1000.0, 21.5, 22.5, 23.5, 0.0)
+        with pytest.raises(struct.error):
+            leaf.fetch()
+
+    def test_read_element_wrong_length(self, root):
+        leaf = _ReplyPLeaf(Addr(1), root)
+        leaf.payload = struct.pack("<f", 1.5)
+        assert leaf.gain_pv0 == 1.5
+
+        # a reply of other length than the memory element is not decoded
+        leaf.payload = struct.pack("<ff", 1.5, 0.0)
+        with pytest.raises(struct.error):
+            leaf.gain_pv0
+
+
+class TestLeafData:
+    def test_as_dict(self):
+        data = PLeafData(Pressure(100), Celsius(20), Celsius(21), Celsius(22))
+        d = data._as_dict()
+        assert list(d.keys()) == [
+            "pressure",
+            "temperature_sensor",
+            "temperature_external_1",
+            "temperature_external_2",
+        ]
+        assert d["pressure"] == 100
+        assert abs(d["temperature_sensor"] - 20) < 1e-9
+
+    def test_as_dict_single_field(self):
+        data = _SingleFieldData(Celsius(25))
+        assert list(data._as_dict()) == ["temperature"]
+        assert LeafData()._as_dict() == {}
+
+    def test_average(self):
+        samples = [
+            PLeafData(Pressure(p), Celsius(t), Celsius(t), Celsius(t))
+            for p, t in [(100, 20), (200, 30)]
+        ]
+        avg = Leaf.average(samples)
+        assert isinstance(avg, PLeafData)
+        assert avg.pressure == 150
+        assert abs(avg.temperature_external_2 - 25) < 1e-9
+        assert avg._as_dict()["pressure"] == 150
@@ -0,0 +1,57 @@
+import os
+import threading
+
+from xerxes_protocol.ids import DevId, MsgId
+from xerxes_protocol.network import Addr, XerxesNetwork
+from xerxes_protocol.hierarchy.root import XerxesRoot
+from xerxes_protocol.hierarchy.leaves.leaf import Leaf
+from tests.frames import device_frame
+
+
+class TestRoot:
+    def test_ping(self, loopback):
+        com, master = loopback
+        xr = XerxesRoot(Addr(0x1E), XerxesNetwork(com).init())
+        reply = bytes(MsgId.PING_REPLY) + bytes([int(DevId.PRESSURE_600MBAR), 1, 4])
+        os.write(master, device_frame(0x05, 0x1E, reply))
+
+        rpl = xr.ping(0x05)
+        assert rpl.dev_id == DevId.PRESSURE_600MBAR
+        assert (rpl.v_maj, rpl.v_min) == (1, 4)
+        assert os.read(master, 64) == device_frame(0x1E, 0x05, bytes(MsgId.PING))
+
+    def test_broadcast_locked(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        xr = XerxesRoot(Addr(0x1E), xn)
+
+        # broadcast waits for a running exchange to finish
+        with xn.exchange_lock:
+            t = threading.Thread(target=xr.sync)
+            t.start()
+            t.join(0.05)
+            assert t.is_alive()
+        t.join(1)
+        assert not t.is_alive()
+        assert os.read(master, 64) == device_frame(0x1E, 0xFF, bytes(MsgId.SYNC))
+
+    def test_leaf_commands_locked(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        leaf = Leaf(0x05, XerxesRoot(Addr(0x1E), xn))
+
+        # commands without a reply wait for a running exchange as well
+        for command, args in ((leaf.reset_soft, ()), (leaf.sleep, (10,))):
+            with xn.exchange_lock:
+                t = threading.Thread(target=command, args=args)
+                t.start()
+                t.join(0.05)
+                assert t.is_alive()
+            t.join(1)
+            assert not t.is_alive()
+
+        sleep = bytes(MsgId.SLEEP) + (10).to_bytes(4, "little")
+        assert os.read(master, 64) == (
+            device_frame(0x1E, 0x05, bytes(MsgId.RESET_SOFT))
+            + device_frame(0x1E, 0x05, sleep)
+        )
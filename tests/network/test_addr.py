@@ -16,9 +16,24 @@ class TestAddr:
     def test_length_2(self):
         with pytest.raises(AssertionError):
             a1 = Addr(256)
+
+    def test_empty_bytes(self):
+        with pytest.raises(AssertionError):
+            Addr(b"")
             
     
     def test_eq_1(self):
         Addr(0x01) == Addr(b"\x01")
         
-    
\ No newline at end of file
+    
+
+    def test_cached(self):
+        assert Addr(0x12) is Addr(0x12)
+        assert Addr(b"\x12") is Addr(0x12)
+        assert type(Addr(0xFF)) is Addr
+
+    def test_int_semantics(self):
+        assert Addr(0x12) == 0x12
+        assert hash(Addr(0x12)) == hash(0x12)
+        assert {Addr(0x12): "leaf"}[0x12] == "leaf"
+        assert Addr(0x12) != 18.5
@@ -1,5 +1,17 @@
 import pytest
-from xerxes_protocol.network import checksum
+from xerxes_protocol.network import checksum, build_frame
 
 def test_checksum_1():
-    assert checksum(b"1A2B3C4D5E6F") == b"6"
\ No newline at end of file
+    assert checksum(b"1A2B3C4D5E6F") == b"6"
+
+
+def test_checksum_complement():
+    for message in [b"", b"\x00", b"\x01", b"\xff\xff", bytes(range(256))]:
+        assert (sum(message) + checksum(message)[0]) % 0x100 == 0
+        assert len(checksum(message)) == 1
+
+
+def test_build_frame():
+    frame = build_frame(0x1E, 0x05, b"\x00\x04\xAA")
+    assert frame[:-1] == b"\x01\x08\x1E\x05\x00\x04\xAA"
+    assert frame[-1:] == checksum(frame[:-1])
@@ -1,8 +1,19 @@
+import gc
+import os
 import warnings
 import pytest
 import serial
-from xerxes_protocol.network import Addr, XerxesNetwork, FutureXerxesNetwork
+from xerxes_protocol.network import (
+    Addr,
+    XerxesNetwork,
+    FutureXerxesNetwork,
+    ChecksumError,
+    InvalidMessage,
+    MessageIncomplete,
+    checksum,
+)
 from xerxes_protocol.ids import MsgId
+from tests.frames import device_frame
 
 
 class TestNetwork:
@@ -12,6 +23,42 @@ class TestNetwork:
         assert xn.opened
 
 
+    def test_init_unchanged(self, loopback, monkeypatch):
+        com, _ = loopback
+        xn = XerxesNetwork(com).init()
+        calls = []
+        monkeypatch.setattr(com, "_reconfigure_port", lambda *a: calls.append(a))
+        monkeypatch.setattr(com, "open", lambda: calls.append("open"))
+        assert xn.init() is xn
+        assert calls == []
+
+        xn.init(timeout=0.05)
+        assert len(calls) == 1
+        assert xn.timeout == 0.05
+
+
+    def test_instances(self, loopback):
+        com, _ = loopback
+        xn = XerxesNetwork(com)
+        assert XerxesNetwork(com) is xn
+        assert com in XerxesNetwork._instances
+
+        del xn
+        gc.collect()
+        assert com not in XerxesNetwork._instances
+
+    def test_collected_keeps_port_open(self, loopback):
+        com, _ = loopback
+
+        def init():
+            XerxesNetwork(com).init()
+
+        init()
+        gc.collect()
+        assert com not in XerxesNetwork._instances
+        assert com.is_open
+
+
     def test_ping(self, com_port, hw_com):
         xn = XerxesNetwork(com_port).init()
         xn.send_msg(Addr(0), Addr(1), bytes(MsgId.PING))
@@ -25,6 +72,124 @@ class TestNetwork:
                 raise
 
 
+    def test_send_frame(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        sent = xn.send_msg(Addr(0x1E), 0x01, bytes(MsgId.PING))
+        frame = os.read(master, 64)
+        assert sent == len(frame) == 7
+        assert frame == b"\x01\x07\x1e\x01\x00\x00" + checksum(frame[:-1])
+        assert sum(frame) % 0x100 == 0
+
+    def test_send_single_write(self, loopback, monkeypatch):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        payload = bytes(MsgId.WRITE) + bytes(range(248))
+
+        # the whole frame goes to the port in one write call
+        writes = []
+        serial_write = com.write
+        monkeypatch.setattr(com, "write", lambda d: writes.append(bytes(d)) or serial_write(d))
+        xn.send_msg(Addr(0x1E), Addr(0x01), payload)
+        assert len(writes) == 1
+        assert writes[0][4:-1] == payload
+        assert os.read(master, 512) == writes[0]
+
+    def test_request(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        # reply is queued before the request is sent
+        os.write(master, device_frame(0x01, 0x1E, bytes(MsgId.PING_REPLY) + b"\x03\x01\x04"))
+        reply = xn.request(Addr(0x1E), Addr(0x01), bytes(MsgId.PING))
+        assert os.read(master, 64)[:6] == b"\x01\x07\x1e\x01\x00\x00"
+        assert reply.message_id == MsgId.PING_REPLY
+        assert reply.source == 0x01
+        assert reply.destination == 0x1E
+        assert reply.payload == b"\x03\x01\x04"
+
+    def test_read_msg(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        payload = bytes(MsgId.READ_REPLY) + bytes(range(32))
+        # leading noise before the start of header is skipped
+        os.write(master, b"\x00\xff" + device_frame(0x05, 0x1E, payload))
+        msg = xn.read_msg()
+        assert msg.source == 0x05
+        assert msg.destination == 0x1E
+        assert msg.length == len(payload) + 5
+        assert msg.message_id == MsgId.READ_REPLY
+        assert msg.payload == bytes(range(32))
+
+    def test_read_msg_max_length(self, loopback, monkeypatch):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        payload = bytes(MsgId.READ_REPLY) + bytes(range(248))
+        frame = device_frame(0x05, 0x1E, payload)
+        os.write(master, b"\x00\xff" + frame)
+
+        # past the start of header, the header and the body (payload and
+        # checksum) are each read in a single bounded read
+        reads = []
+        serial_read = com.read
+        monkeypatch.setattr(com, "read", lambda n=1: reads.append(n) or serial_read(n))
+        msg = xn.read_msg()
+        assert msg.payload == bytes(range(248))
+        msg_len = frame[1]
+        assert reads[-2:] == [5, msg_len - 6]
+        assert reads[:-2] == [1] * len(reads[:-2])
+
+    def test_read_msg_checksum(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        frame = bytearray(device_frame(0x05, 0x1E, bytes(MsgId.ACK_OK)))
+        frame[-1] ^= 0x01
+        os.write(master, bytes(frame))
+        with pytest.raises(ChecksumError):
+            xn.read_msg()
+
+    def test_read_msg_incomplete(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        os.write(master, device_frame(0x05, 0x1E, bytes(MsgId.ACK_OK))[:-2])
+        with pytest.raises(MessageIncomplete):
+            xn.read_msg()
+
+    def test_read_msg_invalid_length(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        # length byte 6 can not describe a frame with a message ID and checksum
+        os.write(master, b"\x01\x06\x05\x1e\x02\x00\xd4")
+        with pytest.raises(InvalidMessage):
+            xn.read_msg()
+
+    def test_read_msg_no_length(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        os.write(master, b"\x01")
+        with pytest.raises(MessageIncomplete):
+            xn.read_msg()
+
+    def test_read_msg_timeout(self, loopback):
+        com, _ = loopback
+        xn = XerxesNetwork(com).init()
+        with pytest.raises(TimeoutError):
+            xn.read_msg()
+
+    def test_read_msg_noise_only(self, loopback):
+        com, master = loopback
+        xn = XerxesNetwork(com).init()
+        os.write(master, b"\xff" * 300)
+        with pytest.raises(TimeoutError, match="300 received bytes"):
+            xn.read_msg()
+
+    def test_wait_for_reply_restores_timeout(self, loopback):
+        com, _ = loopback
+        xn = XerxesNetwork(com).init(timeout=0.02)
+        with pytest.raises(TimeoutError):
+            xn.wait_for_reply(0.01)
+        assert xn.timeout == 0.02
+
+
 class TestFutureNetwork:
     def test_send(self):
         with pytest.raises(NotImplementedError):
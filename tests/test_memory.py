@@ -6,6 +6,10 @@ from xerxes_protocol.memory import (
     float_t,
     double_t,
     MemoryElement,
+    MemoryNonVolatile,
+    MemoryVolatile,
+    MemoryReadOnly,
+    XerxesMemoryMap,
 )
 
 
@@ -36,9 +40,28 @@ class TestElemType:
         assert double_t._container == float
     
 
+    def test_memory_type_struct(self):
+        for elem_type in [uint64_t, uint32_t, uint16_t, uint8_t, float_t, double_t]:
+            assert elem_type._struct.size == elem_type._length
+            assert elem_type._struct.format == "<" + elem_type._format
+
+        assert float_t._struct.unpack(float_t._struct.pack(1.5))[0] == 1.5
+
     def test_memory_element(self):
         me = MemoryElement(0, uint64_t, False)
         assert me.elem_addr == 0
         assert me.elem_type == uint64_t
         assert me.write_access is False
         assert me.can_write() is False
+
+
+class TestMemoryType:
+    def test_mem_fields(self):
+        fields = dict(XerxesMemoryMap._mem_fields)
+        assert fields["gain_pv0"] is MemoryNonVolatile.gain_pv0
+        assert fields["memory_lock"] is MemoryVolatile.memory_lock
+        assert fields["device_uid"] is MemoryReadOnly.device_uid
+        assert len(fields) == sum(
+            len(m._mem_fields)
+            for m in (MemoryNonVolatile, MemoryVolatile, MemoryReadOnly)
+        )
@@ -0,0 +1,16 @@
+from xerxes_protocol.stats import mean_axis0
+
+
+class TestMeanAxis0:
+    def test_columns(self):
+        assert mean_axis0([[1, 10], [3, 30]]) == [2.0, 20.0]
+
+    def test_single_row(self):
+        assert mean_axis0([[1.5, -2.0, 0]]) == [1.5, -2.0, 0.0]
+
+    def test_no_columns(self):
+        assert mean_axis0([[], []]) == []
+
+    def test_compensated(self):
+        rows = [[1e16], [1.0], [-1e16], [1.0]]
+        assert mean_axis0(rows) == [0.5]
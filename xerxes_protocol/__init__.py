@@ -30,6 +30,7 @@ from xerxes_protocol.network import (
     InvalidMessage,
     NetworkError,
     checksum,
+    build_frame,
 )
 from xerxes_protocol.ids import (
     MsgIdMixin,
@@ -10,7 +10,12 @@ from xerxes_protocol.units.unit import Index
 import struct
 
 
-@dataclass
+# 6 floats: distance1, distance2, raw1, raw2, temp_e1, temp_e2
+_FETCH_STRUCT = struct.Struct("<ffffff")
+_FETCH_REQ = bytes(MsgId.FETCH_MEASUREMENT)
+
+
+@dataclass(eq=False, slots=True)
 class DLeafData(LeafData):
     distance_1: Length
     distance_2: Length
@@ -21,19 +26,21 @@ class DLeafData(LeafData):
 
 
 class DLeaf(Leaf):
+    __slots__ = ()
+
     def fetch(self) -> DLeafData:
-        reply = self.exchange(bytes(MsgId.FETCH_MEASUREMENT))
+        reply = self.exchange(_FETCH_REQ)
 
-        values = struct.unpack("ffffff", reply.payload)  # unpack 6 floats: distance1, distance2, raw1, raw2, temp_e1, temp_e2
+        values = _FETCH_STRUCT.unpack(reply.payload)
 
         # convert to sensible units
         return DLeafData(
-            distance_1=Length(values[0]),
-            distance_2=Length(values[1]),
-            raw_1=Index(values[2]),
-            raw_2=Index(values[3]),
-            temperature_external_1=Celsius(values[4]),
-            temperature_external_2=Celsius(values[5])
+            Length(values[0]),  # distance_1
+            Length(values[1]),  # distance_2
+            Index(values[2]),  # raw_1
+            Index(values[3]),  # raw_2
+            Celsius(values[4]),  # temperature_external_1
+            Celsius(values[5]),  # temperature_external_2
         )
         
             
@@ -9,7 +9,12 @@ from xerxes_protocol.units.temp import Celsius
 import struct
 
 
-@dataclass
+# 5 floats: ang_x, ang_y, temp_sensor, temp_e1, temp_e2
+_FETCH_STRUCT = struct.Struct("<fffff")
+_FETCH_REQ = bytes(MsgId.FETCH_MEASUREMENT)
+
+
+@dataclass(eq=False, slots=True)
 class ILeafData(LeafData):
     angle_x: Angle
     angle_y: Angle
@@ -19,18 +24,20 @@ class ILeafData(LeafData):
 
 
 class ILeaf(Leaf):
+    __slots__ = ()
+
     def fetch(self) -> ILeafData:
-        reply = self.exchange(bytes(MsgId.FETCH_MEASUREMENT))
+        reply = self.exchange(_FETCH_REQ)
 
-        values = struct.unpack("fffff", reply.payload)  # unpack 5 floats: ang_x, ang_y, temp_sensor, temp_e1, temp_e2
+        values = _FETCH_STRUCT.unpack(reply.payload)
 
         # convert to sensible units
         return ILeafData(
-            angle_x=Angle.from_degrees(values[0]),
-            angle_y=Angle.from_degrees(values[1]),
-            temperature_sensor=Celsius(values[2]),
-            temperature_external_1=Celsius(values[3]),
-            temperature_external_2=Celsius(values[4])
+            Angle.from_degrees(values[0]),  # angle_x
+            Angle.from_degrees(values[1]),  # angle_y
+            Celsius(values[2]),  # temperature_sensor
+            Celsius(values[3]),  # temperature_external_1
+            Celsius(values[4]),  # temperature_external_2
         )
         
             
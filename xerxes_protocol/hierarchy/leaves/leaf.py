@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from dataclasses import dataclass
-from typing import Any, List
+import asyncio
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
 from xerxes_protocol.ids import MsgId, MAGIC_UNLOCK
 from xerxes_protocol.network import (
@@ -10,11 +13,16 @@ from xerxes_protocol.network import (
     XerxesMessage,
     XerxesPingReply,
     XerxesNetwork,
-    NetworkError,
 )
 from xerxes_protocol.hierarchy.root import XerxesRoot
 from xerxes_protocol.units.unit import Unit
-from xerxes_protocol.memory import XerxesMemoryMap, MemoryElement
+from xerxes_protocol.stats import mean_axis0
+from xerxes_protocol.memory import (
+    XerxesMemoryMap,
+    MemoryElement,
+    MemoryNonVolatile,
+    MemoryVolatile,
+)
 
 import struct
 import logging
@@ -33,6 +41,35 @@ __date__ = "2023-05-15"
 __all__ = ["LeafConfig", "LeafData", "Leaf"]
 
 
+# message ids, converted once at import time
+_MSG_READ_REQ = int(MsgId.READ_REQ)
+_MSG_WRITE = int(MsgId.WRITE)
+_MSG_GET_INFO = bytes(MsgId.MSGID_GET_INFO)
+_MSG_RESET_SOFT = bytes(MsgId.RESET_SOFT)
+_MSG_RESET_HARD = bytes(MsgId.RESET_HARD)
+_MSG_SLEEP = int(MsgId.SLEEP)
+
+# precompiled request headers: <MsgId:uint16> <REG_ADDR:uint16> [<LEN:uint8>]
+_READ_REQ_HDR = struct.Struct("<HHB")
+_WRITE_HDR = struct.Struct("<HH")
+# sleep request: <MsgId:uint16> <DURATION_US:uint32>
+_SLEEP_MSG = struct.Struct("<HI")
+
+# longest register block fitting into a single reply (255 - 7 bytes of framing)
+_MAX_READ_LENGTH = 248
+
+
+@lru_cache(maxsize=256)
+def _read_req_payload(reg_addr: int, length: int) -> bytes:
+    """Return the (cached) payload of a read request."""
+    return _READ_REQ_HDR.pack(_MSG_READ_REQ, reg_addr, length)
+
+
+def _preferred(value: Any) -> Any:
+    """Convert a unit to its preferred representation, pass other values."""
+    return value.preferred() if isinstance(value, Unit) else value
+
+
 class WriteError(Exception):
     """Base class for all write errors."""
 
@@ -64,7 +101,7 @@ class LeafConfig:
     calcStat: int = 1 << 1
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class LeafData(object):
     """Base class for all leaf data classes.
 
@@ -72,31 +109,187 @@ class LeafData(object):
     represent the data of a leaf in a convenient way.
     """
 
+    @classmethod
+    def _field_names(cls) -> tuple:
+        """Return the names of the dataclass fields, cached on the class."""
+        names = cls.__dict__.get("_cached_fields")
+        if names is None:
+            names = tuple(f.name for f in fields(cls))
+            # cache on the class itself, subclasses have their own fields
+            setattr(cls, "_cached_fields", names)
+        return names
+
+    @classmethod
+    def _field_getter(cls) -> Callable[[Any], tuple]:
+        """Return a callable fetching all field values as a tuple, cached on the class."""
+        getter = cls.__dict__.get("_cached_getter")
+        if getter is None:
+            names = cls._field_names()
+            if len(names) > 1:
+                getter = attrgetter(*names)
+            else:
+                # attrgetter returns a bare value for a single name
+                getters = tuple(attrgetter(name) for name in names)
+
+                def getter(obj):
+                    return tuple(g(obj) for g in getters)
+
+            setattr(cls, "_cached_getter", getter)
+        return getter
+
     def _as_dict(self):
         """Return a dictionary representation of the data."""
+        cls = type(self)
         d = {}
 
-        # for every attribute in the class
-        for attribute in self.__dir__():
+        # for every field of the dataclass, all values fetched at once
+        for name, attr_val in zip(cls._field_names(), cls._field_getter()(self)):
+            # if the attribute is a unit
+            if isinstance(attr_val, Unit):
+                d[name] = attr_val.preferred()
 
-            # if the attribute is not a private attribute
-            if not attribute.startswith("_"):
+            # if the attribute is basic datatype
+            elif isinstance(attr_val, (int, float, str, dict, list)):
+                d[name] = attr_val
 
-                # get value of the attribute
-                attr_val = self.__getattribute__(attribute)
+        return d
 
-                # if the attribute is basic datatype
-                if isinstance(attr_val, (int, float, str, dict, list)):
-                    d.update({attribute: attr_val})
 
-                # if the attribute is a unit
-                elif isinstance(attr_val, Unit):
-                    d.update({attribute: attr_val.preferred()})
+class _MemoryElementDescriptor:
+    """Data descriptor reading/writing a memory element of the leaf.
 
-        return d
+    Args:
+        key (str): The name of the memory element, e.g. "gain_pv0".
+        elem (MemoryElement): The memory element, e.g. MemoryElement(0, float_t).
+    """
+
+    __slots__ = ("key", "elem_addr", "fmt", "write_access", "struct", "read_req")
+
+    def __init__(self, key: str, elem: MemoryElement):
+        self.key = key
+        self.elem_addr = elem.elem_addr
+        self.fmt = elem.elem_type._format
+        self.write_access = elem.write_access
+        self.struct = elem.elem_type._struct
+        # the request is the same for every read of the element
+        self.read_req = _read_req_payload(elem.elem_addr, elem.elem_type._length)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        _log.debug(
+            f"Reading memory element:{self.key} at address:{self.elem_addr},"
+            f" type:{self.fmt}."
+        )
+        # read the memory element - the result is a bytes object
+        _r = obj.exchange(self.read_req).payload
+
+        # unpack the bytes object into a tuple
+        _r_val = self.struct.unpack(_r)[0]
+        _log.debug(f"Read value: {_r_val}")
+        return _r_val
+
+    def __set__(self, obj, value):
+        assert isinstance(
+            value, (int, float)
+        ), f"Value must be of type float or int, got {type(value)} instead."
+
+        # check if memory element is writable
+        if not self.write_access:
+            raise WriteErrorReadOnly("Memory element is not writable.")
+
+        # pack the value into a bytes object, using the format of the memory element
+        _bv = self.struct.pack(value)
+        _log.debug(
+            f"Writing memory element:{self.key} at address:{self.elem_addr},"
+            f" type:{self.fmt}, value:{value}."
+        )
+        # write the bytes object to the memory element
+        if not obj.write_reg_net(self.elem_addr, _bv):
+            raise RuntimeError("Failed to write to memory element")
+
+
+def _memory_elements(memory_map: Any) -> Dict[str, MemoryElement]:
+    """Return all public memory elements of the memory map, keyed by name."""
+    return dict(memory_map._mem_fields)
 
 
-class Leaf:
+# names of the configuration (non-volatile) and volatile memory elements
+_CONFIG_KEYS = tuple(_memory_elements(MemoryNonVolatile))
+_VOLATILE_KEYS = tuple(_memory_elements(MemoryVolatile))
+
+
+@lru_cache(maxsize=256)
+def _plan_reads(leaf_cls: type, keys: Tuple[str, ...]) -> tuple:
+    """Merge the memory elements into runs of adjacent ones, read at once.
+
+    The plans are cached, so the keys should be given in a canonical order,
+    see Leaf.read_params.
+
+    Args:
+        leaf_cls (type): Leaf class, its ``_mem_table`` maps the element names
+            to their (address, length, format).
+        keys (Tuple[str, ...]): Names of the memory elements to read.
+
+    Returns:
+        tuple: (base address, length, names, struct) of every run, the struct
+            decodes all elements of the run at once.
+
+    Raises:
+        KeyError: If the memory map has no element of such name.
+    """
+
+    mem_table = leaf_cls._mem_table
+    runs = []
+    for addr, length, fmt, key in sorted(mem_table[k] + (k,) for k in keys):
+        if runs:
+            base, end, fmts, names = runs[-1]
+            if addr == end and end + length - base <= _MAX_READ_LENGTH:
+                fmts.append(fmt)
+                names.append(key)
+                runs[-1] = (base, end + length, fmts, names)
+                continue
+        runs.append((addr, addr + length, [fmt], [key]))
+
+    return tuple(
+        (base, end - base, tuple(names), struct.Struct("<" + "".join(fmts)))
+        for base, end, fmts, names in runs
+    )
+
+
+class _LeafMeta(type):
+    """Metaclass creating the memory map access descriptors of leaf classes.
+
+    The descriptors are the same for every instance, so they are installed
+    on the class once, when a class defining its own ``_memory_map`` is
+    created. Subclasses inherit them.
+
+    The class also gets ``_mem_table`` mapping the element names to their
+    ``(address, length, format)`` triplets, the batched read plans are built
+    from it.
+    """
+
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+
+        memory_map = namespace.get("_memory_map")
+        if memory_map is None:
+            return
+
+        # create convenient access method for memory map
+        mem_table = {}
+        for key, elem in _memory_elements(memory_map).items():
+            setattr(cls, key, _MemoryElementDescriptor(key, elem))
+            mem_table[key] = (
+                elem.elem_addr,
+                elem.elem_type._length,
+                elem.elem_type._format,
+            )
+        cls._mem_table = mem_table
+
+
+class Leaf(metaclass=_LeafMeta):
     """Base class for all leaf classes.
 
     This class is the base class for all leaf classes. It is used to represent
@@ -112,11 +305,13 @@ class Leaf:
         root (XerxesRoot): The root node of the network.
     """
 
+    __slots__ = ("_address", "root")
+
     _memory_map = XerxesMemoryMap()
 
     def __init__(self, addr: int | Addr, root: XerxesRoot):
-        # try to convert addr to Addr if it is an integer
-        if isinstance(addr, int):
+        # try to convert addr to Addr if it is a plain integer
+        if type(addr) is int:
             addr = Addr(addr)
 
         # check if addr is an Addr
@@ -130,71 +325,6 @@ class Leaf:
 
         self.root: XerxesRoot = root
 
-        # create convenient access method for memory map
-        for key in dir(self._memory_map):
-            # skip private attributes
-            if key.startswith("_"):
-                continue
-
-            attr: Any | MemoryElement = getattr(self._memory_map, key)
-            # if attribute is a memory element, create a convenient access method for it
-            if isinstance(attr, MemoryElement):
-                # key is for example: "gain_pv0"
-                # attr is for example: MemoryElement(0, float_t)
-
-                # define dynamic getter
-                def make_fget(_attr: MemoryElement, _key: str):
-                    def fget(self):
-                        _log.debug(
-                            f"Reading memory element:{_key} at address:{_attr.elem_addr},"
-                            f" type:{_attr.elem_type._format}."
-                        )
-                        # read the memory element - the result is a bytes object
-                        _r = self.read_reg_net(
-                            _attr.elem_addr, _attr.elem_type._length
-                        )
-
-                        # unpack the bytes object into a tuple
-                        _r_val = struct.unpack(_attr.elem_type._format, _r)[0]
-                        _log.debug(f"Read value: {_r_val}")
-                        return _r_val
-
-                    return fget
-
-                # define dynamic setter
-                def make_fset(_attr: MemoryElement, _key: str):
-                    def setter(self, value):
-                        assert isinstance(
-                            value, (int, float)
-                        ), f"Value must be of type float or int, got {type(value)} instead."
-
-                        # check if memory element is writable
-                        if not _attr.write_access:
-                            raise WriteErrorReadOnly(
-                                "Memory element is not writable."
-                            )
-
-                        # pack the value into a bytes object, using the format of the memory element
-                        _bv = struct.pack(_attr.elem_type._format, value)
-                        _log.debug(
-                            f"Writing memory element:{_key} at address:{_attr.elem_addr},"
-                            f" type:{_attr.elem_type._format}, value:{value}."
-                        )
-                        # write the bytes object to the memory element
-                        if not self.write_reg_net(_attr.elem_addr, _bv):
-                            raise RuntimeError(
-                                "Failed to write to memory element"
-                            )
-
-                    return setter
-
-                # set the getter and setter as properties
-                setattr(
-                    self.__class__,
-                    key,
-                    property(make_fget(attr, key), make_fset(attr, key)),
-                )
-
     @property
     def network(self) -> XerxesNetwork:
         """The network of the leaf."""
@@ -212,10 +342,10 @@ class Leaf:
 
     def _send_msg_to_leaf(self, payload: bytes) -> int | None:
         """Sends a message to the leaf."""
-        if not isinstance(payload, bytes):
+        if type(payload) is not bytes:
             payload = bytes(payload)
 
-        return self.root.send_msg(self._address, payload)
+        return self.root._send_msg_fast(self._address, payload)
 
     def exchange(self, payload: bytes) -> XerxesMessage:
         """Sends a message to the leaf and returns the reply.
@@ -225,13 +355,15 @@ class Leaf:
 
         Returns:
             XerxesMessage: The message received from the leaf.
+
+        Raises:
+            NetworkError: If the message was not sent.
         """
 
-        if self._send_msg_to_leaf(payload):
-            # if message was sent successfully, read the reply
-            return self.root.network.read_msg()
-        else:
-            raise NetworkError("Failed to send message to leaf.")
+        if type(payload) is not bytes:
+            payload = bytes(payload)
+
+        return self.root.request(self._address, payload)
 
     def read_reg_net(self, reg_addr: int, length: int) -> bytes:
         """Encapsulates the read_reg method to return only the payload."""
@@ -249,19 +381,58 @@ class Leaf:
             XerxesMessage: The message received from the leaf.
         """
 
-        length = int(length)
-        reg_addr = int(reg_addr)
-        payload = (
-            bytes(MsgId.READ_REQ)
-            + reg_addr.to_bytes(2, "little")
-            + length.to_bytes(1, "little")
-        )
+        payload = _read_req_payload(int(reg_addr), int(length))
         return self.exchange(payload)
 
+    def read_params(self, keys: Sequence[str]) -> Dict[str, int | float]:
+        """Reads multiple memory elements of the leaf at once.
+
+        Memory elements which follow each other in the memory of the leaf are
+        read with a single request, which saves a round-trip per element.
+
+        Args:
+            keys (Sequence[str]): Names of the memory elements, e.g.
+                ["gain_pv0", "gain_pv1"].
+
+        Returns:
+            Dict[str, int | float]: Values of the memory elements by name.
+
+        Raises:
+            KeyError: If the memory map has no element of such name.
+        """
+
+        plan = _plan_reads(type(self), tuple(sorted(set(keys))))
+
+        values = {}
+        for base, length, names, run_struct in plan:
+            payload = self.read_reg_net(base, length)
+            values.update(zip(names, run_struct.unpack(payload)))
+        return values
+
+    def fetch_config(self) -> Dict[str, int | float]:
+        """Reads the whole configuration (non-volatile memory) of the leaf.
+
+        Returns:
+            Dict[str, int | float]: Values of the configuration by name.
+        """
+
+        return self.read_params(_CONFIG_KEYS)
+
+    def fetch_volatile(self) -> Dict[str, int | float]:
+        """Reads the whole volatile memory (process values, statistics...) of the leaf.
+
+        The volatile memory is contiguous, so it is read with a single request.
+
+        Returns:
+            Dict[str, int | float]: Values of the volatile memory by name.
+        """
+
+        return self.read_params(_VOLATILE_KEYS)
+
     @property
     def info(self) -> XerxesMessage:
         """Returns the info message of the leaf."""
-        info_payload = self.exchange(bytes(MsgId.MSGID_GET_INFO))
+        info_payload = self.exchange(_MSG_GET_INFO)
         info = info_payload.payload.decode("utf-8")
         return info
 
@@ -276,14 +447,52 @@ class Leaf:
             XerxesMessage: The message received from the leaf.
         """
 
-        reg_addr = int(reg_addr)
-        payload = bytes(MsgId.WRITE) + reg_addr.to_bytes(2, "little") + value
+        payload = _WRITE_HDR.pack(_MSG_WRITE, int(reg_addr)) + value
+
+        # it takes ~60ms for flash to be re-written
+        return self.root.request(self._address, payload, timeout=0.1)
+
+    async def aread_reg(self, reg_addr: int, length: int) -> XerxesMessage:
+        """Reads a register from the leaf without blocking the event loop.
+
+        The exchange runs in a worker thread, see Leaf.read_reg.
+        """
+
+        return await asyncio.to_thread(self.read_reg, reg_addr, length)
+
+    async def awrite_reg(self, reg_addr: int, value: bytes) -> XerxesMessage:
+        """Writes a register to the leaf without blocking the event loop.
+
+        The exchange runs in a worker thread, see Leaf.write_reg.
+        """
+
+        return await asyncio.to_thread(self.write_reg, reg_addr, value)
+
+    async def apply_config(self, config: Dict[str, int | float]) -> None:
+        """Writes multiple memory elements of the leaf concurrently.
 
-        self.root.send_msg(self._address, payload)
-        reply = self.root.network.wait_for_reply(
-            timeout=0.1
-        )  # it takes ~60ms for flash to be re-written
-        return reply
+        The writes are issued together, the network serializes them on the
+        bus. Writes to other leaves (e.g. other apply_config calls gathered
+        by the caller) are interleaved between them.
+
+        Args:
+            config (Dict[str, int | float]): Values of the memory elements by
+                name, e.g. {"gain_pv0": 1.0, "offset_pv0": 0.0}.
+
+        Raises:
+            KeyError: If the memory map has no element of such name.
+        """
+
+        for key in config:
+            if key not in self._mem_table:
+                raise KeyError(key)
+
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(setattr, self, key, value)
+                for key, value in config.items()
+            )
+        )
 
     def write_reg_net(self, reg_addr: int, value: bytes) -> bool:
         """Encapsulates the write_reg method to return only the payload."""
@@ -299,7 +508,7 @@ class Leaf:
         """Restarts the leaf."""
 
         _log.info("Resetting leaf...")
-        self.root.send_msg(self._address, bytes(MsgId.RESET_SOFT))
+        self.root._send_msg_fast(self._address, _MSG_RESET_SOFT)
 
     def reset_hard(self) -> None:
         """Resets the leaf to factory settings."""
@@ -308,15 +517,14 @@ class Leaf:
         _log.debug("Unlocking memory for hard reset")
         self.memory_lock = MAGIC_UNLOCK
         _log.debug("Memory unlocked, resetting leaf to factory settings.")
-        self.root.send_msg(self._address, bytes(MsgId.RESET_HARD))
+        self.root._send_msg_fast(self._address, _MSG_RESET_HARD)
 
     def sleep(self, duration_us: int | float) -> None:
         """Puts the leaf to sleep."""
         duration_us = int(duration_us)
         assert duration_us >= 0, "Duration must be positive."
 
-        duration_b = struct.pack("I", duration_us)
-        sleep_msg_b = bytes(MsgId.SLEEP) + duration_b
+        sleep_msg_b = _SLEEP_MSG.pack(_MSG_SLEEP, duration_us)
         # send the sleep command to the leaf
         # the leaf will go to sleep immediately after receiving the command and will not reply
         self._send_msg_to_leaf(sleep_msg_b)
@@ -331,17 +539,19 @@ class Leaf:
             _addr, int
         ), f"Address must be of type int, got {type(_addr)} instead."
 
+        # validate the new address before anything is written to the leaf
+        new_addr = Addr(_addr)
+
         try:
-            # try to set the address to the new value
-            _log.debug(
-                f"Setting address from: {self.device_address} to: {_addr}."
-            )
+            # try to set the address to the new value, log the cached address
+            # only - reading device_address here would cost a round-trip
+            _log.debug(f"Setting address from: {self._address} to: {new_addr}.")
 
-            self.device_address = int(_addr)
-            self._address = Addr(_addr)
+            self.device_address = int(new_addr)
 
-            _log.debug(f"Address set to: {self.device_address}")
             # if the address was set, set the address property to the new value
+            self._address = new_addr
+            _log.debug(f"Address set to: {self._address}")
 
         except ValueError:
             raise ValueError(
@@ -370,38 +580,31 @@ class Leaf:
             array (List[LeafData]): The list of leaf data objects.
 
         Returns:
-            LeafData: The average of the list of leaf data objects.
+            LeafData: The average of the list of leaf data objects. The result
+                is of the same class as the elements of the list, its fields
+                hold plain numbers in the preferred units of the inputs.
         """
 
         assert isinstance(array, list)
         assert isinstance(array[0], LeafData)
 
-        average = {}
-        for data in array:
-            for attribute in data.__dir__():
-                if not attribute.startswith("_"):
-                    # if entry is not in the dict, create empty list
-                    if not average.get(attribute):
-                        average[attribute] = []
-
-                    # convert attribute val to reasonable number if necessary
-                    attr_val = data.__getattribute__(attribute)
-                    if isinstance(attr_val, Unit):
-                        attr_val = attr_val.preferred()
-                    average[attribute].append(attr_val)
-
-        average_class = LeafData()
-        for key in average:
-            averages = average[key]
-            if len(averages) > 0:
-                average_class.__setattr__(key, sum(averages) / len(averages))
-        return average_class
+        data_class = type(array[0])
+        field_names = data_class._field_names()
+
+        # one row of preferred values per sample, averaged column-wise
+        rows = [
+            [_preferred(getattr(data, name)) for name in field_names]
+            for data in array
+        ]
+
+        # fields hold the averaged values in preferred units
+        return data_class(*mean_axis0(rows))
 
     def __eq__(self, __o: object) -> bool:
-        """Returns True if the addresses of the two leaves are equal therefore they are the same leaf."""
+        """Returns True if both leaves are of the same class and their addresses are equal therefore they are the same leaf."""
 
-        return isinstance(__o, Leaf) and self._address == __o.address
+        return type(__o) is type(self) and self._address == __o._address
 
     def __hash__(self) -> int:
         """Returns the hash of the address of the leaf - unique for each leaf."""
-        return hash(self.address)
+        return hash(self._address)
@@ -9,7 +9,12 @@ from xerxes_protocol.units.temp import Celsius
 import struct
 
 
-@dataclass
+# 4 floats: pressure in Pa, temp_sensor, temp_e1, temp_e2
+_FETCH_STRUCT = struct.Struct("<ffff")
+_FETCH_REQ = bytes(MsgId.FETCH_MEASUREMENT)
+
+
+@dataclass(eq=False, slots=True)
 class PLeafData(LeafData):
     pressure: Pressure
     temperature_sensor: Celsius
@@ -18,17 +23,19 @@ class PLeafData(LeafData):
 
 
 class PLeaf(Leaf):
+    __slots__ = ()
+
     def fetch(self) -> PLeafData:
-        reply = self.exchange(bytes(MsgId.FETCH_MEASUREMENT))
+        reply = self.exchange(_FETCH_REQ)
 
-        values = struct.unpack("ffff", reply.payload)  # unpack 5 floats: pressure in Pa, temp_sensor, temp_e1, temp_e2
+        values = _FETCH_STRUCT.unpack(reply.payload)
 
         # convert to sensible units
         return PLeafData(
-            pressure=Pressure(values[0]),
-            temperature_sensor=Celsius(values[1]),
-            temperature_external_1=Celsius(values[2]),
-            temperature_external_2=Celsius(values[3])
+            Pressure(values[0]),  # pressure
+            Celsius(values[1]),  # temperature_sensor
+            Celsius(values[2]),  # temperature_external_1
+            Celsius(values[3]),  # temperature_external_2
         )
         
             
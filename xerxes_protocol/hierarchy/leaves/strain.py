@@ -9,7 +9,12 @@ from xerxes_protocol.units.temp import Celsius
 import struct
 
 
-@dataclass
+# 3 floats: strain, temp_e1, temp_e2
+_FETCH_STRUCT = struct.Struct("<fff")
+_FETCH_REQ = bytes(MsgId.FETCH_MEASUREMENT)
+
+
+@dataclass(eq=False, slots=True)
 class SLeafData(LeafData):
     strain: Unit
     temperature_external_1: Celsius
@@ -17,16 +22,18 @@ class SLeafData(LeafData):
 
 
 class SLeaf(Leaf):
+    __slots__ = ()
+
     def fetch(self) -> SLeafData:
-        reply = self.exchange(bytes(MsgId.FETCH_MEASUREMENT))
+        reply = self.exchange(_FETCH_REQ)
 
-        values = struct.unpack("fff", reply.payload)  # unpack 3 floats: strain, temp_e1, temp_e2
+        values = _FETCH_STRUCT.unpack(reply.payload)
 
         # convert to sensible units
         return SLeafData(
-            strain=Unit(values[0]),
-            temperature_external_1=Celsius(values[1]),
-            temperature_external_2=Celsius(values[2])
+            Unit(values[0]),  # strain
+            Celsius(values[1]),  # temperature_external_1
+            Celsius(values[2]),  # temperature_external_2
         )
         
             
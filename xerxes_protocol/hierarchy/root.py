@@ -12,10 +12,12 @@ from xerxes_protocol.defaults import (
 from xerxes_protocol.ids import MsgId, DevId
 from xerxes_protocol.network import (
     Addr,
+    XerxesMessage,
     XerxesNetwork,
     NetworkError,
     XerxesPingReply,
     MessageIncomplete,
+    InvalidMessage,
     ChecksumError,
 )
 import logging
@@ -36,6 +38,10 @@ __all__ = ["XerxesRoot", "BROADCAST_ADDR"]
 
 BROADCAST_ADDR = Addr(DEFAULT_BROADCAST_ADDRESS)
 
+# message ids, converted once at import time
+_MSG_PING = bytes(MsgId.PING)
+_MSG_SYNC = bytes(MsgId.SYNC)
+
 
 class XerxesRoot:
     """Root node of the Xerxes network.
@@ -53,11 +59,13 @@ class XerxesRoot:
         network (XerxesNetwork): The network to use.
     """
 
+    __slots__ = ("_addr", "network")
+
     def __init__(self, my_addr: Union[int, bytes], network: XerxesNetwork):
-        if isinstance(my_addr, (int, bytes)):
-            self._addr = Addr(my_addr)
-        elif isinstance(my_addr, Addr):
+        if type(my_addr) is Addr:
             self._addr = my_addr
+        elif isinstance(my_addr, (int, bytes)):
+            self._addr = Addr(my_addr)
         else:
             raise TypeError(
                 f"my_addr type wrong, expected Union[Addr, int, bytes], got {type(my_addr)} instead"
@@ -83,12 +91,43 @@ class XerxesRoot:
         """
 
         # send the message to the network - all checks are done in the network
-        bytes_sent = self.network.send_msg(
-            source=self._addr, destination=destination, payload=payload
-        )
+        # no reply is expected, but must not interleave with an exchange
+        with self.network.exchange_lock:
+            bytes_sent = self.network.send_msg(
+                source=self._addr, destination=destination, payload=payload
+            )
 
         return bytes_sent
 
+    def request(
+        self, destination: Addr, payload: bytes, timeout: float | None = None
+    ) -> XerxesMessage:
+        """Send a message to the network and return the reply.
+
+        Args:
+            destination (Addr): The destination address.
+            payload (bytes): The payload to send.
+            timeout (float | None, optional): Time to wait for the reply in
+                seconds. Defaults to None = the network timeout.
+
+        Returns:
+            XerxesMessage: The reply. See XerxesNetwork.request.
+        """
+
+        return self.network.request(self._addr, destination, payload, timeout)
+
+    def _send_msg_fast(self, destination: Addr, payload: bytes) -> int | None:
+        """Send a message to the network, without checking the arguments.
+
+        Used internally by the leaves, which already hold their address as
+        Addr and the payload as bytes. See send_msg.
+        """
+
+        with self.network.exchange_lock:
+            return self.network._send_msg_fast(
+                self._addr, destination, payload
+            )
+
     @property
     def address(self):
         return self._addr
@@ -99,13 +138,16 @@ class XerxesRoot:
 
     def broadcast(self, payload: bytes) -> None:
         """Broadcast a message to the network = all nodes."""
-        self.network.send_msg(
-            source=self.address, destination=BROADCAST_ADDR, payload=payload
-        )
+
+        # no reply is expected, but must not interleave with an exchange
+        with self.network.exchange_lock:
+            self.network.send_msg(
+                source=self.address, destination=BROADCAST_ADDR, payload=payload
+            )
 
     def sync(self) -> None:
         """Send a sync message to the network."""
-        self.broadcast(payload=bytes(MsgId.SYNC))
+        self.broadcast(payload=_MSG_SYNC)
 
     def ping(
         self, addr: Addr | int | bytes, attempts: int = 3
@@ -123,26 +165,14 @@ class XerxesRoot:
         # sanitize the number of attempts
         attempts = max(1, int(attempts))
 
-        # sanitize the address
-        if isinstance(addr, int):
-            addr = Addr(addr)
-
-        addr = bytes(addr)
-
-        assert isinstance(
-            addr, bytes
-        ), f"addr type wrong, expected int, bytes or Addr, got {type(addr)} instead"
+        # sanitize the address, Addr asserts the type
+        addr = Addr(addr)
 
         for attempt in range(int(attempts)):
             start = time.perf_counter()
 
-            self.network.send_msg(
-                source=self.address,
-                destination=addr,
-                payload=bytes(MsgId.PING),
-            )
             try:
-                reply = self.network.read_msg()
+                reply = self.network.request(self._addr, addr, _MSG_PING)
             except TimeoutError:
                 _log.debug(
                     f"Timeout while waiting for ping reply, attempt {attempt + 1} of {attempts}"
@@ -158,6 +188,11 @@ class XerxesRoot:
                     f"Checksum error while waiting for ping reply, attempt {attempt + 1} of {attempts}"
                 )
                 continue
+            except InvalidMessage:
+                _log.debug(
+                    f"Invalid message while waiting for ping reply, attempt {attempt + 1} of {attempts}"
+                )
+                continue
 
             end = time.perf_counter()
 
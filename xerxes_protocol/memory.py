@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+import struct
 
 __author__ = "theMladyPan"
 __version__ = "1.4.2"
@@ -94,12 +95,19 @@ class ElementType:
         _container (bytes | int | float | bool): The container type of the memory type.
         _format (str): The format of the memory type. See struct module for more information.
         _length (int): The length of the memory type in bytes.
+        _struct (struct.Struct): Compiled little-endian struct of the format,
+            shared by all elements of the type.
     """
 
     _container: bytes | int | float | bool
     _format: str
     _length: int
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # compile the format once per type (explicit little-endian, no padding)
+        cls._struct = struct.Struct("<" + cls._format)
+
 
 class uint64_t(ElementType):
     """Represents a 64 bit unsigned integer in memory."""
@@ -178,7 +186,24 @@ class MemoryElement:
 
 
 class XerxesMemoryType:
-    """Represents a memory access type in the Xerxes memory map."""
+    """Represents a memory access type in the Xerxes memory map.
+
+    Attributes:
+        _mem_fields (tuple): (name, MemoryElement) pairs of all public memory
+            elements of the class including the inherited ones, collected
+            once at class creation.
+    """
+
+    _mem_fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = {}
+        for klass in reversed(cls.__mro__):
+            for name, attr in vars(klass).items():
+                if not name.startswith("_") and isinstance(attr, MemoryElement):
+                    fields[name] = attr
+        cls._mem_fields = tuple(fields.items())
 
     def __str__(self):
         return f"{self.__class__.__name__}(...)"
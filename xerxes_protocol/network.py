@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 import struct
 import time
@@ -11,6 +12,7 @@ from xerxes_protocol.ids import DevId, MsgId
 from xerxes_protocol.defaults import DEFAULT_BAUDRATE, DEFAULT_TIMEOUT
 import logging
 from threading import Lock
+import weakref
 
 log = logging.getLogger(__name__)
 
@@ -21,6 +23,7 @@ _all_ = [
     "LengthError",
     "NetworkError",
     "checksum",
+    "build_frame",
     "Addr",
     "XerxesMessage",
     "XerxesPingReply",
@@ -38,6 +41,16 @@ __package__ = "xerxes_protocol"
 __date__ = "2023-05-15"
 
 
+# length, source, destination and message ID of a received message
+_RX_HDR = struct.Struct("<BBBH")
+
+# at most this many bytes are skipped when searching for the start of header
+_MAX_SKIP = 1024
+
+# start of header, length, source and destination of a sent message
+_TX_HDR = struct.Struct("<BBBB")
+
+
 class ChecksumError(Exception):
     """Raised when the checksum of a message is invalid."""
 
@@ -64,11 +77,29 @@ def checksum(message: bytes) -> bytes:
         bytes: Checksum of the message.
     """
 
-    summary = sum(message)
-    summary ^= 0xFF  # get complement of summary
-    summary += 1  # get 2's complement
-    summary %= 0x100  # get last 8 bits of summary
-    return summary.to_bytes(1, "little")
+    # 2's complement of the last 8 bits of the sum
+    return bytes(((-sum(message)) & 0xFF,))
+
+
+def build_frame(source: int, destination: int, payload: bytes) -> bytearray:
+    """Builds a complete Xerxes frame, checksum included.
+
+    Args:
+        source (int): Address of the sender.
+        destination (int): Address of the recipient.
+        payload (bytes): Payload of the message, message ID included.
+
+    Returns:
+        bytearray: Frame ready to be sent.
+    """
+
+    # header, payload and checksum in a single buffer
+    length = len(payload) + 5
+    frame = bytearray(length)
+    _TX_HDR.pack_into(frame, 0, 0x01, length, source, destination)
+    frame[4:-1] = payload
+    frame[-1] = (-sum(frame)) & 0xFF  # checksum byte is still zero here
+    return frame
 
 
 class Addr(int):
@@ -84,11 +115,17 @@ class Addr(int):
         AssertionError: If the address is not of type int or bytes.
         AssertionError: If the address is negative.
         AssertionError: If the address is greater than 255.
+        AssertionError: If the address is given as empty bytes.
     """
 
-    def __new__(cls, addr: Union[int, bytes]) -> None:
+    def __new__(cls, addr: Union[int, bytes]) -> "Addr":
         if isinstance(addr, bytes):
-            addr = int(addr.hex(), 16)
+            assert len(addr) >= 1, "address must not be empty"
+            addr = int.from_bytes(addr, "big")
+
+        # fast path: all the 256 valid addresses are premade, see _ADDR_CACHE
+        if type(addr) is int and 0 <= addr < 256 and cls is Addr:
+            return _ADDR_CACHE[addr]
 
         assert isinstance(
             addr, int
@@ -109,11 +146,9 @@ class Addr(int):
     def __repr__(self):
         return f"Addr(0x{self.to_bytes().hex()})"
 
-    def __eq__(self, __o: object) -> bool:
-        return int(self) == int(__o)
 
-    def __hash__(self) -> int:
-        return int(self)
+# Addr is immutable, so the instances of all valid addresses are shared
+_ADDR_CACHE = tuple(int.__new__(Addr, i) for i in range(256))
 
 
 @dataclass
@@ -195,8 +230,12 @@ class XerxesNetwork:
 
     Attributes:
         _ic (int): Internal counter for message ids
-        _instances (dict): Dictionary of instances of XerxesNetwork
+        _instances (weakref.WeakValueDictionary): Instances of XerxesNetwork
+            by serial port, released once no longer used - the serial port
+            itself is owned by the caller and is never closed here
         _opened (bool): True if the port is opened, False otherwise
+        exchange_lock (Lock): Held for the whole request-reply exchange, so
+            concurrent exchanges (e.g. from worker threads) do not interleave
 
     Raises:
         AssertionError: If the port is not a serial.Serial object
@@ -227,7 +266,7 @@ class XerxesNetwork:
     """
 
     _ic = 0  # not used yet
-    _instances = {}
+    _instances = weakref.WeakValueDictionary()
     _opened = False
     _bus_lock = Lock()
 
@@ -249,13 +288,15 @@ class XerxesNetwork:
         Returns:
             XerxesNetwork: self
         """
-        self._s.baudrate = baudrate
-        self._s.timeout = timeout
+        # each setter reconfigures an opened port, do so only on changes
+        if self._s.baudrate != baudrate:
+            self._s.baudrate = baudrate
+        if self._s.timeout != timeout:
+            self._s.timeout = timeout
 
         if not self._s.isOpen():
             self._s.open()
         self._opened = True
-        self._s._reconfigure_port()
 
         return self
 
@@ -269,8 +310,8 @@ class XerxesNetwork:
     def timeout(self, value: float) -> None:
         """Timeout for serial port in seconds."""
 
+        # pyserial reconfigures an opened port in the timeout setter
         self._s.timeout = value
-        self._s._reconfigure_port()
 
     @property
     def opened(self) -> bool:
@@ -278,11 +319,14 @@ class XerxesNetwork:
 
         return bool(self._opened)
 
-    def __new__(cls: XerxesNetwork, port: str) -> XerxesNetwork:
-        if port not in cls._instances.keys():
-            cls._instances[port] = object.__new__(cls)
+    def __new__(cls, port: serial.Serial) -> XerxesNetwork:
+        instance = cls._instances.get(port)
+        if instance is None:
+            instance = object.__new__(cls)
+            instance.exchange_lock = Lock()
+            cls._instances[port] = instance
 
-        return cls._instances[port]
+        return instance
 
     def __repr__(self) -> str:
         _repr = (
@@ -291,9 +335,6 @@ class XerxesNetwork:
         )
         return _repr
 
-    def __del__(self):
-        self._s.close()
-
     @property
     def is_busy(self):
         return self._bus_lock.locked()
@@ -307,6 +348,7 @@ class XerxesNetwork:
         Raises:
             TimeoutError: If no message is received in the timeout period
             MessageIncomplete: If the message is incomplete
+            InvalidMessage: If the message length is invalid
             ChecksumError: If the checksum is invalid
         """
         assert self._opened, "Serial port not opened yet. Call .init() first"
@@ -316,59 +358,30 @@ class XerxesNetwork:
         # lock the bus for exclusive access
         with self._bus_lock:
 
-            # wait for start of message
-            next_byte = self._s.read(1)
-            while next_byte != b"\x01":
-                next_byte = self._s.read(1)
-                if len(next_byte) == 0:
-                    raise TimeoutError("No message in queue")
-
-            chs = 0x01
-            # read message length
-            msg_len = int(self._s.read(1).hex(), 16)
+            # skip to the start of message, within a single timeout
+            skipped = self._s.read_until(b"\x01", _MAX_SKIP)
+            if not skipped:
+                raise TimeoutError("No message in queue")
+            if skipped[-1] != 0x01:
+                raise TimeoutError(
+                    f"No start of message in {len(skipped)} received bytes"
+                )
+
+            # read the fixed size header: length, source, destination and
+            # message ID, the shortest valid message is 7 bytes long
+            header = self._read_exact(_RX_HDR.size)
+            msg_len, src, dst, msg_id = _RX_HDR.unpack(header)
             log.debug(f"Message length: {msg_len}")
-            chs += msg_len
-
-            # read source and destination address
-            src = self._s.read(1)
-            dst = self._s.read(1)
+            if msg_len < 7:
+                raise InvalidMessage(f"Invalid message length {msg_len} received")
 
-            for i in [src, dst]:
-                chs += int(i.hex(), 16)
+            # read the payload and checksum at once
+            rest = self._read_exact(msg_len - 6)
 
-            # read message ID
-            msg_id_raw = self._s.read(2)
-            if len(msg_id_raw) != 2:
-                raise MessageIncomplete("Invalid message id received")
-            for i in msg_id_raw:
-                chs += i
+        raw_msg = rest[:-1]
 
-            msg_id = struct.unpack("H", msg_id_raw)[0]
-
-            # read and unpack all data into array, assuming it is uint32_t, little-endian
-            raw_msg = bytes(0)
-
-            # for i in range(int(msg_len - 7)):
-            #     next_byte = self._s.read(1)  # WIP: read multiple bytes at once for fuck sake
-            #     if (len(next_byte) != 1):
-            #         raise MessageIncomplete("Received message incomplete")
-            #     raw_msg += next_byte
-            #     chs += int(next_byte.hex(), 16)
-
-            raw_msg += self._s.read(msg_len - 7)
-            if len(raw_msg) != msg_len - 7:
-                raise MessageIncomplete("Received message incomplete")
-
-            for _b in raw_msg:
-                chs += _b
-
-            # read checksum
-            rcvd_chks = self._s.read(1)
-
-        if len(rcvd_chks) != 1:
-            raise MessageIncomplete("Received message incomplete")
-        chs += int(rcvd_chks.hex(), 16)
-        chs %= 0x100
+        # SOH + length + rest of the message including checksum must be 0
+        chs = (0x01 + sum(header) + sum(rest)) & 0xFF
         if chs:
             raise ChecksumError("Invalid checksum received")
 
@@ -384,6 +397,25 @@ class XerxesNetwork:
             crc=chs,
         )
 
+    def _read_exact(self, size: int) -> bytes:
+        """Read exactly size bytes from the serial port.
+
+        Args:
+            size (int): number of bytes to read
+
+        Returns:
+            bytes: received data
+
+        Raises:
+            MessageIncomplete: If fewer bytes arrive within the timeout
+        """
+        data = self._s.read(size)
+        if len(data) != size:
+            raise MessageIncomplete(
+                f"Received message incomplete, got {len(data)} of {size} bytes"
+            )
+        return data
+
     def wait_for_reply(self, timeout: float) -> XerxesMessage:
         """Wait for reply from device for a given time
 
@@ -393,13 +425,65 @@ class XerxesNetwork:
         Returns:
             XerxesMessage: reply message
         """
+        with self._temp_timeout(timeout):
+            return self.read_msg()
+
+    @contextmanager
+    def _temp_timeout(self, timeout: float):
+        """Temporarily set the timeout of the serial port.
+
+        The port is reconfigured only if the timeout differs from the current
+        one, and the original timeout is restored even if reading fails.
+
+        Args:
+            timeout (float): timeout in seconds
+        """
         old_t = self._s.timeout
+        if old_t == timeout:
+            yield
+            return
+
         self._s.timeout = timeout
-        self._s._reconfigure_port()
-        rply = self.read_msg()
-        self._s.timeout = old_t
-        self._s._reconfigure_port()
-        return rply
+        try:
+            yield
+        finally:
+            self._s.timeout = old_t
+
+    def request(
+        self,
+        source: Addr,
+        destination: Addr,
+        payload: bytes,
+        timeout: float | None = None,
+    ) -> XerxesMessage:
+        """Send message to device and read the reply.
+
+        The exchange lock is held from sending the message until the reply is
+        read, so other exchanges on the network can not interleave with it.
+        Arguments are not checked nor converted, see send_msg.
+
+        Args:
+            source (Addr): source address
+            destination (Addr): destination address
+            payload (bytes): payload in bytes - must be less 247 bytes
+            timeout (float | None, optional): time to wait for the reply in
+                seconds. Defaults to None = timeout of the serial port.
+
+        Raises:
+            NetworkError: if the message was not sent
+            TimeoutError: if no reply is received in the timeout period
+
+        Returns:
+            XerxesMessage: reply message
+        """
+
+        with self.exchange_lock:
+            if not self._send_msg_fast(source, destination, payload):
+                raise NetworkError("Failed to send message.")
+
+            if timeout is None:
+                return self.read_msg()
+            return self.wait_for_reply(timeout)
 
     def send_msg(
         self,
@@ -423,42 +507,32 @@ class XerxesNetwork:
             int | None: number of bytes sent or None if serial port is not opened or message was not sent
         """
 
-        assert (
-            self._opened
-        ), "Serial port was not opened yet. Call .init() on XerxesNetwork object first"
-
-        # if source or destination is int, convert to Addr
-        if type(source) is int:
+        # if source or destination is int or bytes, convert to Addr
+        if type(source) is not Addr:
             source = Addr(source)
 
-        if type(destination) is int:
+        if type(destination) is not Addr:
             destination = Addr(destination)
 
         # payload must be in bytes
         assert isinstance(payload, bytes)
 
-        # convert source and destination to bytes if they are not
-        if isinstance(source, bytes):
-            _b_source = source
-        else:
-            _b_source = bytes(source)
-
-        if isinstance(destination, bytes):
-            _b_destination = destination
-        else:
-            _b_destination = bytes(destination)
-
-        # create message
-        SOH = b"\x01"
-
-        msg = SOH  # Start of header
-        msg += (len(payload) + 5).to_bytes(
-            1, "little"
-        )  # Length of the message
-        msg += _b_source  # From - sender
-        msg += _b_destination  # Destination address - recipient
-        msg += payload  # Payload without checksum
-        msg += checksum(msg)  # Checksum
+        return self._send_msg_fast(source, destination, payload)
+
+    def _send_msg_fast(
+        self, source: Addr, destination: Addr, payload: bytes
+    ) -> int | None:
+        """Send message to device, without checking or converting arguments.
+
+        Used internally on the hot path, where the caller already holds the
+        addresses as Addr and the payload as bytes. See send_msg.
+        """
+
+        assert (
+            self._opened
+        ), "Serial port was not opened yet. Call .init() on XerxesNetwork object first"
+
+        msg = build_frame(source, destination, payload)
 
         # send message and return number of bytes sent
         with self._bus_lock:
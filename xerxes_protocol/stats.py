@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from math import fsum
+from typing import List, Sequence
+
+
+__author__ = "theMladyPan"
+__version__ = "1.4.3"
+__license__ = "MIT"
+__email__ = "stanislav@rubint.sk"
+__status__ = "Production"
+__package__ = "xerxes_protocol"
+__date__ = "2023-05-15"
+
+__all__ = ["mean_axis0"]
+
+
+def mean_axis0(rows: Sequence[Sequence[float]]) -> List[float]:
+    """Returns the mean of every column of a table of numbers.
+
+    Each column is reduced by a single C-level pass of math.fsum, which is
+    also exact for long averaging windows (no rounding error build-up).
+
+    Args:
+        rows (Sequence[Sequence[float]]): Rows of equal length, e.g. one row
+            per sample, one column per measured quantity.
+
+    Returns:
+        List[float]: Mean of each column, empty if there are no columns.
+
+    Example:
+        >>> mean_axis0([[1, 10], [3, 30]])
+        [2.0, 20.0]
+    """
+
+    n = len(rows)
+    return [fsum(column) / n for column in zip(*rows)]